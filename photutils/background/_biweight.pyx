@@ -0,0 +1,115 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+# cython: language_level=3
+"""
+This module provides compiled kernels for computing the biweight
+location and biweight midvariance of one-dimensional data.
+"""
+
+cimport cython
+from cython cimport floating
+from libc.math cimport fabs
+
+__all__ = ['biweight_location_1d', 'biweight_midvariance_1d']
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def biweight_location_1d(const floating[::1] values, double c, double M,
+                         double mad):
+    """
+    Compute the biweight location of one-dimensional data in a single
+    pass.
+
+    Parameters
+    ----------
+    values : 1D `~numpy.ndarray` of float32 or float64
+        The C-contiguous input data. It must not contain NaN values.
+        The sums are always accumulated in double precision.
+
+    c : float
+        The tuning constant for the biweight estimator.
+
+    M : float
+        The location estimate around which the biweight weights are
+        computed.
+
+    mad : float
+        The median absolute deviation of the data. It must be positive.
+
+    Returns
+    -------
+    biweight_location : float
+        The biweight location of the data.
+    """
+    cdef Py_ssize_t npixels = values.shape[0]
+    cdef Py_ssize_t i
+    cdef double scale = c * mad
+    cdef double total = 0.0
+    cdef double total_weight = 0.0
+    cdef double diff, u, weight
+
+    with nogil:
+        for i in range(npixels):
+            diff = values[i] - M
+            u = diff / scale
+            if fabs(u) < 1.0:
+                weight = 1.0 - u * u
+                weight *= weight
+                total += diff * weight
+                total_weight += weight
+
+    return M + total / total_weight
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def biweight_midvariance_1d(const floating[::1] values, double c, double M,
+                            double mad):
+    """
+    Compute the biweight midvariance of one-dimensional data in a
+    single pass.
+
+    The sample size is the total number of input values (i.e., it is
+    not reduced for the rejected values).
+
+    Parameters
+    ----------
+    values : 1D `~numpy.ndarray` of float32 or float64
+        The C-contiguous input data. It must not contain NaN values.
+        The sums are always accumulated in double precision.
+
+    c : float
+        The tuning constant for the biweight estimator.
+
+    M : float
+        The location estimate around which the biweight weights are
+        computed.
+
+    mad : float
+        The median absolute deviation of the data. It must be positive.
+
+    Returns
+    -------
+    biweight_midvariance : float
+        The biweight midvariance of the data.
+    """
+    cdef Py_ssize_t npixels = values.shape[0]
+    cdef Py_ssize_t i
+    cdef double scale = c * mad
+    cdef double numerator = 0.0
+    cdef double denominator = 0.0
+    cdef double diff, u, u2, weight
+
+    with nogil:
+        for i in range(npixels):
+            diff = values[i] - M
+            u = diff / scale
+            if fabs(u) < 1.0:
+                u2 = u * u
+                weight = 1.0 - u2
+                numerator += diff * diff * weight * weight * weight * weight
+                denominator += weight * (1.0 - 5.0 * u2)
+
+    return npixels * numerator / (denominator * denominator)
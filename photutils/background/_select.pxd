@@ -0,0 +1,12 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+# cython: language_level=3
+
+# This file is needed in order to be able to cimport functions into
+# other Cython files
+
+from cython cimport floating
+
+
+cdef floating select(floating *values, Py_ssize_t npixels,
+                     Py_ssize_t k) noexcept nogil
+cdef double median(floating *values, Py_ssize_t npixels) noexcept nogil
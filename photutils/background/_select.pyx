@@ -0,0 +1,203 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+# cython: language_level=3
+"""
+This module provides compiled selection algorithms for computing the
+k-th smallest value and the median of one-dimensional data.
+"""
+
+cimport cython
+from cython cimport floating
+
+__all__ = ['introselect_median']
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _insertion_sort(floating *values,
+                          Py_ssize_t npixels) noexcept nogil:
+    """
+    Sort a small array in place using an insertion sort.
+    """
+    cdef Py_ssize_t i, j
+    cdef floating value
+
+    for i in range(1, npixels):
+        value = values[i]
+        j = i
+        while j > 0 and values[j - 1] > value:
+            values[j] = values[j - 1]
+            j -= 1
+        values[j] = value
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _swap(floating *values, Py_ssize_t i,
+                       Py_ssize_t j) noexcept nogil:
+    """
+    Swap two elements of an array.
+    """
+    cdef floating tmp = values[i]
+    values[i] = values[j]
+    values[j] = tmp
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t _median_of_medians(floating *values,
+                                   Py_ssize_t npixels) noexcept nogil:
+    """
+    Find the median of the medians of groups of five values.
+
+    The median of each group is moved to the front of the array and
+    the median of these medians is then selected recursively. The
+    median of medians is guaranteed to lie between the 30th and 70th
+    percentiles of the array, which bounds the size of the next
+    partition.
+
+    The returned index is that of the median of medians. All values
+    before it in the array are less than or equal to it and the next
+    value is greater than or equal to it.
+    """
+    cdef Py_ssize_t i, size
+    cdef Py_ssize_t ngroups = 0
+
+    for i in range(0, npixels, 5):
+        size = min(5, npixels - i)
+        _insertion_sort(values + i, size)
+        _swap(values, ngroups, i + size // 2)
+        ngroups += 1
+
+    select(values, ngroups, ngroups // 2)
+    return ngroups // 2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef floating select(floating *values, Py_ssize_t npixels,
+                     Py_ssize_t k) noexcept nogil:
+    """
+    Return the k-th smallest value of an array using introselect.
+
+    Introselect is a quickselect that switches to a median-of-medians
+    pivot after ``2 * log2(npixels)`` partitioning steps, which
+    guarantees O(N) worst-case complexity while keeping the speed of
+    quickselect for typical data.
+
+    The quickselect pivot is the median of the first, middle, and last
+    values of the partition (following the layout of ``select`` in
+    Numerical Recipes). These three values are ordered such that the
+    first and last values act as sentinels for the partitioning scans,
+    which then do not need bounds checks.
+
+    The array is partially sorted in place such that all values before
+    index ``k`` are less than or equal to the returned value and all
+    values after index ``k`` are greater than or equal to it. The array
+    must not contain NaN values.
+    """
+    cdef Py_ssize_t lo = 0
+    cdef Py_ssize_t hi = npixels - 1
+    cdef Py_ssize_t depth = 0
+    cdef Py_ssize_t i, j
+    cdef floating pivot
+
+    # depth limit of 2 * floor(log2(npixels))
+    i = npixels
+    while i > 1:
+        depth += 2
+        i >>= 1
+
+    while hi > lo + 1:
+        # the median of medians requires at least three groups
+        if depth > 0 or hi - lo < 14:
+            depth -= 1
+            _swap(values, lo + (hi - lo) // 2, lo + 1)
+            if values[lo] > values[hi]:
+                _swap(values, lo, hi)
+            if values[lo + 1] > values[hi]:
+                _swap(values, lo + 1, hi)
+            if values[lo] > values[lo + 1]:
+                _swap(values, lo, lo + 1)
+        else:
+            i = lo + _median_of_medians(values + lo, hi - lo + 1)
+            _swap(values, lo, i - 1)
+            _swap(values, lo + 1, i)
+            _swap(values, hi, i + 1)
+
+        # values[lo] <= pivot <= values[hi]
+        pivot = values[lo + 1]
+        i = lo + 1
+        j = hi
+        while True:
+            i += 1
+            while values[i] < pivot:
+                i += 1
+            j -= 1
+            while values[j] > pivot:
+                j -= 1
+            if j < i:
+                break
+            _swap(values, i, j)
+        values[lo + 1] = values[j]
+        values[j] = pivot
+
+        if j >= k:
+            hi = j - 1
+        if j <= k:
+            lo = i
+
+    if hi == lo + 1 and values[hi] < values[lo]:
+        _swap(values, lo, hi)
+
+    return values[k]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double median(floating *values, Py_ssize_t npixels) noexcept nogil:
+    """
+    Return the median of an array, reordering the array in place.
+
+    The array must not contain NaN values.
+    """
+    cdef Py_ssize_t k = npixels // 2
+    cdef Py_ssize_t i
+    cdef double upper = select(values, npixels, k)
+    cdef double lower
+
+    if npixels % 2 == 1:
+        return upper
+
+    # the lower middle value is the maximum of the values below index k
+    lower = values[0]
+    for i in range(1, k):
+        if values[i] > lower:
+            lower = values[i]
+
+    return (lower + upper) / 2.0
+
+
+def introselect_median(floating[::1] values):
+    """
+    Compute the median of one-dimensional data using introselect.
+
+    Parameters
+    ----------
+    values : 1D `~numpy.ndarray` of float32 or float64
+        The C-contiguous input data. It must not contain NaN values.
+        The array is partially sorted in place.
+
+    Returns
+    -------
+    median : float
+        The median of the data. NaN is returned for empty input.
+    """
+    cdef Py_ssize_t npixels = values.shape[0]
+
+    if npixels == 0:
+        return float('nan')
+
+    with nogil:
+        result = median(&values[0], npixels)
+
+    return result
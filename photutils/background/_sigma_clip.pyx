@@ -0,0 +1,188 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+# cython: language_level=3
+"""
+This module provides compiled kernels for iteratively sigma clipping
+one-dimensional data and the rows of two-dimensional data.
+"""
+
+cimport cython
+from cython cimport floating
+from libc.math cimport INFINITY, NAN, isfinite, sqrt
+from libc.stdlib cimport free, malloc
+
+from ._select cimport median
+
+__all__ = ['sigma_clip_1d', 'sigma_clip_rows']
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef Py_ssize_t _sigma_clip(floating *buf, Py_ssize_t npixels,
+                            double sigma_lower, double sigma_upper,
+                            Py_ssize_t maxiters, double *lower,
+                            double *upper) noexcept nogil:
+    """
+    Iteratively sigma clip an array in place, returning the number of
+    unclipped values and the clipping bounds of the last iteration.
+    """
+    cdef Py_ssize_t niters = 0
+    cdef Py_ssize_t nkeep, i
+    cdef double center, diff, total, total_sq, offset, std
+    cdef floating value
+
+    lower[0] = -INFINITY
+    upper[0] = INFINITY
+    while npixels > 0 and (maxiters < 0 or niters < maxiters):
+        niters += 1
+
+        # the sums are computed relative to the median to avoid a loss
+        # of precision in the variance
+        center = median(buf, npixels)
+        total = 0.0
+        total_sq = 0.0
+        for i in range(npixels):
+            diff = buf[i] - center
+            total += diff
+            total_sq += diff * diff
+        offset = total / npixels
+        std = sqrt(max(total_sq / npixels - offset * offset, 0.0))
+
+        lower[0] = center - sigma_lower * std
+        upper[0] = center + sigma_upper * std
+        nkeep = 0
+        for i in range(npixels):
+            value = buf[i]
+            if lower[0] <= value <= upper[0]:
+                buf[nkeep] = value
+                nkeep += 1
+
+        if nkeep == npixels:
+            break
+        npixels = nkeep
+
+    return npixels
+
+
+def sigma_clip_1d(floating[::1] values, double sigma_lower,
+                  double sigma_upper, Py_ssize_t maxiters):
+    """
+    Iteratively sigma clip one-dimensional data in place.
+
+    At each iteration, the clipping bounds are computed from the median
+    and standard deviation of the remaining values, and the values
+    outside of the bounds are removed by moving the remaining values
+    to the front of the array. The iterations stop when an iteration
+    does not clip any values or after ``maxiters`` iterations.
+
+    Parameters
+    ----------
+    values : 1D `~numpy.ndarray` of float32 or float64
+        The C-contiguous data to be clipped. It must not contain
+        non-finite values. The array is modified in place. The
+        statistics are always accumulated in double precision.
+
+    sigma_lower : float
+        The number of standard deviations to use for the lower clipping
+        bound.
+
+    sigma_upper : float
+        The number of standard deviations to use for the upper clipping
+        bound.
+
+    maxiters : int
+        The maximum number of clipping iterations. If negative, then
+        the iterations continue until convergence.
+
+    Returns
+    -------
+    npixels : int
+        The number of unclipped values, which are stored (in arbitrary
+        order) in the first ``npixels`` elements of ``values``.
+    """
+    cdef Py_ssize_t npixels = values.shape[0]
+    cdef double lower, upper
+
+    if npixels == 0:
+        return 0
+
+    with nogil:
+        npixels = _sigma_clip(&values[0], npixels, sigma_lower,
+                              sigma_upper, maxiters, &lower, &upper)
+
+    return npixels
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sigma_clip_rows(floating[:, ::1] data, double sigma_lower,
+                    double sigma_upper, Py_ssize_t maxiters):
+    """
+    Iteratively sigma clip each row of two-dimensional data in place.
+
+    Each row is clipped independently, as in `sigma_clip_1d`, and then
+    the values of the row that are non-finite or outside of the
+    clipping bounds of the last iteration are replaced by NaN. The GIL
+    is released while clipping, so blocks of rows can be clipped in
+    parallel threads.
+
+    Parameters
+    ----------
+    data : 2D `~numpy.ndarray` of float32 or float64
+        The C-contiguous data to be clipped. The array is modified in
+        place.
+
+    sigma_lower : float
+        The number of standard deviations to use for the lower clipping
+        bound.
+
+    sigma_upper : float
+        The number of standard deviations to use for the upper clipping
+        bound.
+
+    maxiters : int
+        The maximum number of clipping iterations. If negative, then
+        the iterations continue until convergence.
+
+    Returns
+    -------
+    ninvalid : int
+        The number of non-finite values in the input data.
+    """
+    cdef Py_ssize_t nrows = data.shape[0]
+    cdef Py_ssize_t ncols = data.shape[1]
+    cdef Py_ssize_t ninvalid = 0
+    cdef Py_ssize_t row, col, npixels
+    cdef double lower, upper
+    cdef floating value
+    cdef floating *buf
+
+    if nrows == 0 or ncols == 0:
+        return 0
+
+    buf = <floating *> malloc(ncols * sizeof(floating))
+    if buf == NULL:
+        raise MemoryError()
+
+    with nogil:
+        for row in range(nrows):
+            # copy the finite values to the work buffer
+            npixels = 0
+            for col in range(ncols):
+                value = data[row, col]
+                if isfinite(value):
+                    buf[npixels] = value
+                    npixels += 1
+            ninvalid += ncols - npixels
+
+            _sigma_clip(buf, npixels, sigma_lower, sigma_upper, maxiters,
+                        &lower, &upper)
+
+            for col in range(ncols):
+                value = data[row, col]
+                if not (isfinite(value) and lower <= value <= upper):
+                    data[row, col] = NAN
+
+    free(buf)
+
+    return ninvalid
@@ -5,14 +5,29 @@ RMS in an array of any dimension.
 """
 
 import abc
+import copy
+import os
 import warnings
+import weakref
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+import astropy.units as u
 import numpy as np
-from astropy.stats import SigmaClip, mad_std
+from astropy.stats import SigmaClip
+from astropy.utils.exceptions import AstropyUserWarning
 
+from photutils.background._biweight import (biweight_location_1d,
+                                            biweight_midvariance_1d)
+from photutils.background._sigma_clip import sigma_clip_1d, sigma_clip_rows
 from photutils.extern.biweight import biweight_location, biweight_scale
 from photutils.utils._repr import make_repr
-from photutils.utils._stats import nanmean, nanmedian, nanstd
+from photutils.utils._stats import (_median_inplace, _nan_filled,
+                                    _valid_values, fast_nanmad_std,
+                                    fast_nanmedian, nanmean,
+                                    nanmedian_mean_std, nanstd)
 
 SIGMA_CLIP = SigmaClip(sigma=3.0, maxiters=10)
 
@@ -31,6 +46,413 @@ __all__ = [
 ]
 
 
+def _kernel_values(values):
+    """
+    Convert values to a plain `~numpy.ndarray` that can be passed to
+    the compiled kernels.
+
+    Single- and double-precision float values are kept in their input
+    precision (the kernels accumulate in double precision) and all
+    other values are converted to float64.
+
+    Parameters
+    ----------
+    values : array_like
+        The input values.
+
+    Returns
+    -------
+    values : `~numpy.ndarray`
+        The float32 or float64 values.
+    """
+    values = np.asarray(values)
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    return values
+
+
+def _fast_sigma_clip(data, sigma_clip):
+    """
+    Sigma clip the flattened data using a compiled kernel.
+
+    This function gives the same result as calling ``sigma_clip`` with
+    ``axis=None`` and ``masked=False``, except that the unclipped values
+    are returned in arbitrary order. It can be used only when the
+    ``sigma_clip`` object uses the median and standard deviation as the
+    centering and scaling functions and does not grow the clipped mask.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input data.
+
+    sigma_clip : `astropy.stats.SigmaClip`
+        The sigma clipping object.
+
+    Returns
+    -------
+    data : 1D `~numpy.ndarray`
+        The unclipped values.
+    """
+    data = np.asanyarray(data)
+    values = data.compressed() if np.ma.isMaskedArray(data) else data
+    values = _kernel_values(values).ravel()
+
+    # remove invalid values (this always makes a copy, which is
+    # modified in place by the kernel)
+    good_mask = np.isfinite(values)
+    values = values[good_mask]
+    if values.size < good_mask.size:
+        warnings.warn('Input data contains invalid values (NaNs or infs), '
+                      'which were automatically clipped.',
+                      AstropyUserWarning)
+
+    maxiters = sigma_clip.maxiters
+    maxiters = -1 if np.isinf(maxiters) else int(maxiters)
+    npixels = sigma_clip_1d(values, float(sigma_clip.sigma_lower),
+                            float(sigma_clip.sigma_upper), maxiters)
+
+    # return the unclipped values with the input dtype and units
+    values = values[:npixels].astype(data.dtype, copy=False)
+    if isinstance(data, u.Quantity):
+        values <<= data.unit
+
+    return values
+
+
+def _fast_sigma_clip_rows(data, sigma_clip, nproc=1):
+    """
+    Sigma clip the data along the last axis using a compiled kernel.
+
+    This function gives the same result as calling ``sigma_clip`` with
+    ``axis=-1`` and ``masked=False`` for float32 or float64 data. The
+    same restrictions on the ``sigma_clip`` object as for
+    ``_fast_sigma_clip`` apply.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        The input float32 or float64 data. It must not be a masked
+        array.
+
+    sigma_clip : `astropy.stats.SigmaClip`
+        The sigma clipping object.
+
+    nproc : int, optional
+        The number of threads used to clip blocks of rows in parallel.
+        The compiled kernel releases the GIL, so the threads run
+        concurrently. If `None`, then the number of threads is set to
+        the number of CPUs detected on the machine.
+
+    Returns
+    -------
+    data : `~numpy.ndarray`
+        A copy of the data with the clipped values replaced by NaN.
+    """
+    if nproc is None:
+        nproc = os.cpu_count() or 1
+
+    # the kernel modifies the copy in place
+    rows = np.array(data.reshape(-1, data.shape[-1]), copy=True, order='C',
+                    subok=False)
+
+    maxiters = sigma_clip.maxiters
+    maxiters = -1 if np.isinf(maxiters) else int(maxiters)
+    args = (float(sigma_clip.sigma_lower), float(sigma_clip.sigma_upper),
+            maxiters)
+    nproc = min(nproc, rows.shape[0])
+    if nproc > 1:
+        with ThreadPoolExecutor(max_workers=nproc) as executor:
+            futures = [executor.submit(sigma_clip_rows, block, *args)
+                       for block in np.array_split(rows, nproc)]
+            ninvalid = sum(future.result() for future in futures)
+    else:
+        ninvalid = sigma_clip_rows(rows, *args)
+
+    if ninvalid > 0:
+        warnings.warn('Input data contains invalid values (NaNs or infs), '
+                      'which were automatically clipped.',
+                      AstropyUserWarning)
+
+    result = rows.reshape(data.shape)
+    if isinstance(data, u.Quantity):
+        result <<= data.unit
+
+    return result
+
+
+def _sigma_clip(data, sigma_clip, axis=None, nproc=1):
+    """
+    Sigma clip the data, using the compiled kernels when possible.
+    """
+    if (sigma_clip.cenfunc == 'median' and sigma_clip.stdfunc == 'std'
+            and not sigma_clip.grow):
+        if axis is None:
+            return _fast_sigma_clip(data, sigma_clip)
+
+        data = np.asanyarray(data)
+        if (axis in (-1, data.ndim - 1) and data.size > 0
+                and data.dtype in (np.float32, np.float64)
+                and not isinstance(data, np.ma.MaskedArray)):
+            return _fast_sigma_clip_rows(data, sigma_clip, nproc=nproc)
+
+    return sigma_clip(data, axis=axis, masked=False)
+
+
+class _SigmaClipCache:
+    """
+    A small least-recently-used cache of sigma-clipped data.
+
+    Sigma clipping is usually the most expensive step of the background
+    and background RMS estimators, and an estimator is often called
+    repeatedly on the same data with the same sigma clipping parameters.
+    This cache avoids clipping the same data more than once.
+
+    Only C-contiguous `~numpy.ndarray` inputs are cached. The cache
+    keeps only a weak reference to the input data, and the cache key
+    includes a CRC-32 checksum of the data (and mask) buffer so that a
+    stale result is never returned if the data are modified in place
+    between calls. The cached arrays are read-only. Any warnings (e.g.,
+    for invalid input values) are emitted only when the data are
+    actually clipped.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of cached results.
+    """
+
+    def __init__(self, maxsize=2):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __reduce__(self):
+        # the weak references cannot be copied or pickled, so copies
+        # start with an empty cache
+        return (self.__class__, (self.maxsize,))
+
+    def __call__(self, data, sigma_clip, axis=None, nproc=1):
+        """
+        Sigma clip the data, returning a cached result if available.
+
+        Parameters
+        ----------
+        data : array_like or `~numpy.ma.MaskedArray`
+            The input data.
+
+        sigma_clip : `astropy.stats.SigmaClip`
+            The sigma clipping object.
+
+        axis : int, tuple of int, or `None`, optional
+            The axis or axes along which to sigma clip the data.
+
+        nproc : int or `None`, optional
+            The number of threads used to clip the data along the last
+            axis (see ``_fast_sigma_clip_rows``). It does not affect
+            the result.
+
+        Returns
+        -------
+        data : `~numpy.ndarray`
+            The sigma-clipped data (see ``_clip_data``).
+        """
+        key = self._make_key(data, sigma_clip, axis)
+        if key is None:
+            return _sigma_clip(data, sigma_clip, axis=axis, nproc=nproc)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is data:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        result = _sigma_clip(data, sigma_clip, axis=axis, nproc=nproc)
+
+        # do not cache results that are views of the input data
+        if not np.may_share_memory(result, data):
+            result.flags.writeable = False
+            data_ref = weakref.ref(data, partial(self._discard, key))
+            self._entries[key] = (data_ref, result)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return result
+
+    @staticmethod
+    def _make_key(data, sigma_clip, axis):
+        """
+        Return the cache key for the input data and sigma clipping
+        parameters, or `None` if the data cannot be cached.
+        """
+        if not isinstance(data, np.ndarray) or not data.flags.c_contiguous:
+            return None
+
+        checksum = zlib.crc32(data)
+        if np.ma.isMaskedArray(data) and data.mask is not np.ma.nomask:
+            if not data.mask.flags.c_contiguous:
+                return None
+            checksum = zlib.crc32(data.mask, checksum)
+
+        try:
+            return (id(data), checksum, data.shape, data.dtype.str,
+                    getattr(data, 'unit', None), axis,
+                    sigma_clip.sigma_lower, sigma_clip.sigma_upper,
+                    sigma_clip.maxiters, sigma_clip.cenfunc,
+                    sigma_clip.stdfunc, sigma_clip.grow)
+        except TypeError:  # pragma: no cover
+            # unhashable parameters
+            return None
+
+    def _discard(self, key, data_ref):
+        """
+        Remove a cached result when its input data are deleted.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is data_ref:
+            del self._entries[key]
+
+    def clear(self):
+        """
+        Remove all cached results.
+        """
+        self._entries.clear()
+
+
+def _clip_data(data, sigma_clip, axis=None, nproc=1, cache=None):
+    """
+    Sigma clip the input data, if requested, and return an array where
+    the clipped and masked values are ignored.
+
+    `~astropy.stats.SigmaClip` stops iterating as soon as an iteration
+    does not clip any values, so the clipping cost scales with the
+    number of iterations needed to converge rather than ``maxiters``.
+    All of the background and background RMS estimators use this
+    function so that the data are clipped in exactly one place.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input data.
+
+    sigma_clip : `astropy.stats.SigmaClip` or `None`
+        The sigma clipping object. If `None`, then no sigma clipping is
+        performed.
+
+    axis : int, tuple of int, or `None`, optional
+        The axis or axes along which to sigma clip the data.
+
+    nproc : int or `None`, optional
+        The number of threads used to sigma clip the data along the
+        last axis. If `None`, then the number of threads is set to the
+        number of CPUs detected on the machine.
+
+    cache : ``_SigmaClipCache`` or `None`, optional
+        The cache of sigma-clipped results. If `None`, then the data
+        are always clipped. A cached result must not be modified in
+        place. The cache is never used for a masked array without any
+        masked values because its unmasked data array is a new object
+        on each call.
+
+    Returns
+    -------
+    data : `~numpy.ndarray`
+        The data array. If ``axis`` is `None`, then the clipped and
+        masked values are removed from the flattened array. Otherwise,
+        the clipped and masked values are replaced by NaN.
+    """
+    if isinstance(data, np.ma.MaskedArray) and not np.ma.is_masked(data):
+        # avoid the masked-array overhead (and copies) for a masked
+        # array without any masked values
+        data = data.data
+        cache = None
+
+    if sigma_clip is not None:
+        if cache is None:
+            return _sigma_clip(data, sigma_clip, axis=axis, nproc=nproc)
+        return cache(data, sigma_clip, axis=axis, nproc=nproc)
+
+    if isinstance(data, np.ma.MaskedArray):
+        if axis is None:
+            # the flattened statistics need only the unmasked values
+            return data.compressed()
+
+        # convert to a float ndarray with masked values replaced by NaN
+        return _nan_filled(data)
+
+    return data
+
+
+def _use_fast_biweight(data, M, axis):
+    """
+    Return whether the compiled biweight kernels can be used for the
+    input data.
+
+    The kernels operate on the flattened data, so they are used only
+    when ``axis`` is `None`. A user-supplied location guess is
+    supported only if it is a scalar and the data do not have units.
+    """
+    if axis is not None:
+        return False
+    if M is None:
+        return True
+    return np.isscalar(M) and not isinstance(data, u.Quantity)
+
+
+def _fast_biweight(data, c, M, kernel):
+    """
+    Compute a biweight statistic of the flattened data using a
+    compiled kernel.
+
+    The median and median absolute deviation of the data are computed
+    with selection algorithms and then the biweight statistic is
+    computed in a single pass over the data. NaN and masked values are
+    ignored.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input data.
+
+    c : float
+        The tuning constant for the biweight estimator.
+
+    M : float or `None`
+        The initial guess for the biweight location. If `None`, then
+        the median of the data is used.
+
+    kernel : {`biweight_location_1d`, `biweight_midvariance_1d`}
+        The compiled kernel.
+
+    Returns
+    -------
+    result : float or `~astropy.units.Quantity`
+        The biweight location or biweight midvariance of the data.
+    """
+    values = _kernel_values(_valid_values(data))
+
+    if values.size == 0:
+        median = mad = np.nan
+    else:
+        median = _median_inplace(values)
+        mad = _median_inplace(np.abs(values - median))
+    location = median if M is None else M
+
+    # a zero (constant data) or NaN (empty data) MAD gives the location
+    # guess and a zero (or NaN) variance
+    if mad == 0.0 or np.isnan(mad):
+        result = location if kernel is biweight_location_1d else mad**2
+    else:
+        result = kernel(values, c, location, mad)
+    result = np.float64(result)
+
+    if isinstance(data, u.Quantity):
+        unit = data.unit
+        if kernel is biweight_midvariance_1d:
+            unit **= 2
+        result <<= unit
+
+    return result
+
+
 class BackgroundBase(metaclass=abc.ABCMeta):
     """
     Base class for classes that estimate scalar background values.
@@ -42,20 +464,47 @@ class BackgroundBase(metaclass=abc.ABCMeta):
         clipping parameters. If `None` then no sigma clipping will
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
+
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
     """
 
-    def __init__(self, sigma_clip=SIGMA_CLIP):
+    def __init__(self, sigma_clip=SIGMA_CLIP, cache=False):
         if not isinstance(sigma_clip, SigmaClip) and sigma_clip is not None:
             raise TypeError('sigma_clip must be an astropy SigmaClip '
                             'instance or None')
         self.sigma_clip = sigma_clip
+        self.cache = cache
+        self._cache = _SigmaClipCache()
 
     def __repr__(self):
-        return make_repr(self, ('sigma_clip',))
+        return make_repr(self, ('sigma_clip', 'cache'))
 
     def __call__(self, data, axis=None, masked=False):
         return self.calc_background(data, axis=axis, masked=masked)
 
+    @property
+    def _sigma_clip_cache(self):
+        """
+        The sigma-clipping cache, or `None` if caching is disabled.
+        """
+        if not self.cache:
+            # release any results cached before caching was disabled
+            self._cache.clear()
+            return None
+        return self._cache
+
+    def clear_cache(self):
+        """
+        Remove all cached sigma-clipped data.
+        """
+        self._cache.clear()
+
     @abc.abstractmethod
     def calc_background(self, data, axis=None, masked=False):
         """
@@ -85,6 +534,59 @@ class BackgroundBase(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError  # pragma: no cover
 
+    def calc_background_batch(self, data, masked=False, nproc=1):
+        """
+        Calculate the background values of a stack of arrays.
+
+        The background of each array in the stack is calculated over
+        all of its values. The arrays are flattened and the background
+        values are calculated with a single vectorized call along
+        ``axis=1``, which is much faster than calculating the background
+        of each array separately.
+
+        Parameters
+        ----------
+        data : array_like or `~numpy.ma.MaskedArray`
+            The stack of arrays for which to calculate the background
+            values. The first axis indexes the arrays in the stack
+            (e.g., an array of shape ``(K, H, W)`` for ``K`` cutouts of
+            shape ``(H, W)``).
+
+        masked : bool, optional
+            If `True`, then a `~numpy.ma.MaskedArray` is returned. If
+            `False`, then a `~numpy.ndarray` is returned, where masked
+            values have a value of NaN. The default is `False`.
+
+        nproc : int or `None`, optional
+            The number of threads to use to sigma clip the arrays in
+            parallel (if larger than 1). If set to 1, then the arrays
+            are sigma clipped serially. If `None`, then the number of
+            threads will be set to the number of CPUs detected on the
+            machine. Parallel sigma clipping is used only for float32
+            or float64 data that is not a masked array and for the
+            default ``cenfunc`` and ``stdfunc`` of the ``sigma_clip``
+            object. The result does not depend on ``nproc``.
+
+        Returns
+        -------
+        result : `~numpy.ndarray` or `~numpy.ma.MaskedArray`
+            The 1D array of the background values, one for each array in
+            the stack.
+        """
+        data = np.asanyarray(data)
+        if data.ndim < 2:
+            raise ValueError('data must have at least 2 dimensions')
+
+        # sigma clip the data here so that blocks of arrays can be
+        # clipped in parallel threads; the reshaped array is a new
+        # object, so the sigma-clipping cache is not used
+        data = _clip_data(data.reshape(data.shape[0], -1), self.sigma_clip,
+                          axis=1, nproc=nproc)
+        estimator = copy.copy(self)
+        estimator.sigma_clip = None
+
+        return estimator.calc_background(data, axis=1, masked=masked)
+
 
 class BackgroundRMSBase(metaclass=abc.ABCMeta):
     """
@@ -97,20 +599,47 @@ class BackgroundRMSBase(metaclass=abc.ABCMeta):
         clipping parameters. If `None` then no sigma clipping will
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
+
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
     """
 
-    def __init__(self, sigma_clip=SIGMA_CLIP):
+    def __init__(self, sigma_clip=SIGMA_CLIP, cache=False):
         if not isinstance(sigma_clip, SigmaClip) and sigma_clip is not None:
             raise TypeError('sigma_clip must be an astropy SigmaClip '
                             'instance or None')
         self.sigma_clip = sigma_clip
+        self.cache = cache
+        self._cache = _SigmaClipCache()
 
     def __repr__(self):
-        return make_repr(self, ('sigma_clip',))
+        return make_repr(self, ('sigma_clip', 'cache'))
 
     def __call__(self, data, axis=None, masked=False):
         return self.calc_background_rms(data, axis=axis, masked=masked)
 
+    @property
+    def _sigma_clip_cache(self):
+        """
+        The sigma-clipping cache, or `None` if caching is disabled.
+        """
+        if not self.cache:
+            # release any results cached before caching was disabled
+            self._cache.clear()
+            return None
+        return self._cache
+
+    def clear_cache(self):
+        """
+        Remove all cached sigma-clipped data.
+        """
+        self._cache.clear()
+
     @abc.abstractmethod
     def calc_background_rms(self, data, axis=None, masked=False):
         """
@@ -140,6 +669,59 @@ class BackgroundRMSBase(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError  # pragma: no cover
 
+    def calc_background_rms_batch(self, data, masked=False, nproc=1):
+        """
+        Calculate the background RMS values of a stack of arrays.
+
+        The background RMS of each array in the stack is calculated over
+        all of its values. The arrays are flattened and the background RMS
+        values are calculated with a single vectorized call along
+        ``axis=1``, which is much faster than calculating the background RMS
+        of each array separately.
+
+        Parameters
+        ----------
+        data : array_like or `~numpy.ma.MaskedArray`
+            The stack of arrays for which to calculate the background RMS
+            values. The first axis indexes the arrays in the stack
+            (e.g., an array of shape ``(K, H, W)`` for ``K`` cutouts of
+            shape ``(H, W)``).
+
+        masked : bool, optional
+            If `True`, then a `~numpy.ma.MaskedArray` is returned. If
+            `False`, then a `~numpy.ndarray` is returned, where masked
+            values have a value of NaN. The default is `False`.
+
+        nproc : int or `None`, optional
+            The number of threads to use to sigma clip the arrays in
+            parallel (if larger than 1). If set to 1, then the arrays
+            are sigma clipped serially. If `None`, then the number of
+            threads will be set to the number of CPUs detected on the
+            machine. Parallel sigma clipping is used only for float32
+            or float64 data that is not a masked array and for the
+            default ``cenfunc`` and ``stdfunc`` of the ``sigma_clip``
+            object. The result does not depend on ``nproc``.
+
+        Returns
+        -------
+        result : `~numpy.ndarray` or `~numpy.ma.MaskedArray`
+            The 1D array of the background RMS values, one for each array in
+            the stack.
+        """
+        data = np.asanyarray(data)
+        if data.ndim < 2:
+            raise ValueError('data must have at least 2 dimensions')
+
+        # sigma clip the data here so that blocks of arrays can be
+        # clipped in parallel threads; the reshaped array is a new
+        # object, so the sigma-clipping cache is not used
+        data = _clip_data(data.reshape(data.shape[0], -1), self.sigma_clip,
+                          axis=1, nproc=nproc)
+        estimator = copy.copy(self)
+        estimator.sigma_clip = None
+
+        return estimator.calc_background_rms(data, axis=1, masked=masked)
+
 
 class MeanBackground(BackgroundBase):
     """
@@ -154,6 +736,14 @@ class MeanBackground(BackgroundBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -178,10 +768,8 @@ class MeanBackground(BackgroundBase):
     """
 
     def calc_background(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
@@ -207,6 +795,14 @@ class MedianBackground(BackgroundBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -231,16 +827,13 @@ class MedianBackground(BackgroundBase):
     """
 
     def calc_background(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
             warnings.simplefilter('ignore', RuntimeWarning)
-            result = nanmedian(data, axis=axis)
+            result = fast_nanmedian(data, axis=axis)
 
         if masked and isinstance(result, np.ndarray):
             result = np.ma.masked_where(np.isnan(result), result)
@@ -267,6 +860,14 @@ class ModeEstimatorBackground(BackgroundBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -292,27 +893,34 @@ class ModeEstimatorBackground(BackgroundBase):
     """
 
     def __init__(self, median_factor=3.0, mean_factor=2.0,
-                 sigma_clip=SIGMA_CLIP):
-        super().__init__(sigma_clip=sigma_clip)
+                 sigma_clip=SIGMA_CLIP, cache=False):
+        super().__init__(sigma_clip=sigma_clip, cache=cache)
         self.median_factor = median_factor
         self.mean_factor = mean_factor
 
     def __repr__(self):
-        params = ('median_factor', 'mean_factor', 'sigma_clip')
+        params = ('median_factor', 'mean_factor', 'sigma_clip', 'cache')
         return make_repr(self, params)
 
     def calc_background(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
             warnings.simplefilter('ignore', RuntimeWarning)
-            result = ((self.median_factor * nanmedian(data, axis=axis))
-                      - (self.mean_factor * nanmean(data, axis=axis)))
+            median = fast_nanmedian(data, axis=axis)
+            mean = nanmean(data, axis=axis)
+            if isinstance(median, np.ndarray) and median.ndim > 0:
+                # combine the statistics in place to avoid allocating
+                # temporary arrays
+                median *= self.median_factor
+                mean *= self.mean_factor
+                median -= mean
+                result = median
+            else:
+                result = ((self.median_factor * median)
+                          - (self.mean_factor * mean))
 
         if masked and isinstance(result, np.ndarray):
             result = np.ma.masked_where(np.isnan(result), result)
@@ -336,6 +944,14 @@ class MMMBackground(ModeEstimatorBackground):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -360,9 +976,9 @@ class MMMBackground(ModeEstimatorBackground):
     49.5
     """
 
-    def __init__(self, sigma_clip=SIGMA_CLIP):
+    def __init__(self, sigma_clip=SIGMA_CLIP, cache=False):
         super().__init__(median_factor=3.0, mean_factor=2.0,
-                         sigma_clip=sigma_clip)
+                         sigma_clip=sigma_clip, cache=cache)
 
 
 class SExtractorBackground(BackgroundBase):
@@ -384,6 +1000,14 @@ class SExtractorBackground(BackgroundBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -408,36 +1032,32 @@ class SExtractorBackground(BackgroundBase):
     """
 
     def calc_background(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
             warnings.simplefilter('ignore', RuntimeWarning)
 
-            _median = np.atleast_1d(nanmedian(data, axis=axis))
-            _mean = np.atleast_1d(nanmean(data, axis=axis))
-            _std = np.atleast_1d(nanstd(data, axis=axis))
-            bkg = (2.5 * _median) - (1.5 * _mean)
-
-            # set the background to the mean where the std is zero
-            mean_mask = _std == 0
-            bkg[mean_mask] = _mean[mean_mask]
-
-            # set the background to the median when the absolute
-            # difference between the mean and median divided by the
-            # standard deviation is greater than or equal to 0.3
-
-            med_mask = (np.abs(_mean - _median) / _std) >= 0.3
-            mask = np.logical_and(med_mask, np.logical_not(mean_mask))
-            bkg[mask] = _median[mask]
+            if axis is None:
+                # extract the valid values only once for all statistics
+                stats = nanmedian_mean_std(data)
+            else:
+                stats = (fast_nanmedian(data, axis=axis),
+                         nanmean(data, axis=axis), nanstd(data, axis=axis))
+            _median, _mean, _std = stats
+
+            # use the median when the absolute difference between the
+            # mean and median divided by the standard deviation is
+            # greater than or equal to 0.3 and the mean where the
+            # standard deviation is zero
+            bkg = np.where(np.abs(_mean - _median) >= 0.3 * _std, _median,
+                           (2.5 * _median) - (1.5 * _mean))
+            bkg = np.where(_std == 0, _mean, bkg)
 
             # if bkg is a scalar, return it as a float
-            if bkg.shape == (1,) and axis is None:
-                bkg = bkg[0]
+            if bkg.ndim == 0:
+                bkg = bkg[()]
 
         if masked and isinstance(bkg, np.ndarray):
             bkg = np.ma.masked_where(np.isnan(bkg), bkg)
@@ -466,6 +1086,14 @@ class BiweightLocationBackground(BackgroundBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -489,27 +1117,28 @@ class BiweightLocationBackground(BackgroundBase):
     49.5
     """
 
-    def __init__(self, c=6, M=None, sigma_clip=SIGMA_CLIP):
-        super().__init__(sigma_clip=sigma_clip)
+    def __init__(self, c=6, M=None, sigma_clip=SIGMA_CLIP, cache=False):
+        super().__init__(sigma_clip=sigma_clip, cache=cache)
         self.c = c
         self.M = M
 
     def __repr__(self):
-        params = ('c', 'M', 'sigma_clip')
+        params = ('c', 'M', 'sigma_clip', 'cache')
         return make_repr(self, params)
 
     def calc_background(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
-
-        # ignore RuntimeWarning where axis is all NaN
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore', RuntimeWarning)
-            result = biweight_location(data, c=self.c, M=self.M, axis=axis,
-                                       ignore_nan=True)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
+
+        if _use_fast_biweight(data, self.M, axis):
+            result = _fast_biweight(data, self.c, self.M,
+                                    biweight_location_1d)
+        else:
+            # ignore RuntimeWarning where axis is all NaN
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                result = biweight_location(data, c=self.c, M=self.M,
+                                           axis=axis, ignore_nan=True)
 
         if masked and isinstance(result, np.ndarray):
             result = np.ma.masked_where(np.isnan(result), result)
@@ -530,6 +1159,14 @@ class StdBackgroundRMS(BackgroundRMSBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -554,11 +1191,8 @@ class StdBackgroundRMS(BackgroundRMSBase):
     """
 
     def calc_background_rms(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
@@ -595,6 +1229,14 @@ class MADStdBackgroundRMS(BackgroundRMSBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -619,16 +1261,13 @@ class MADStdBackgroundRMS(BackgroundRMSBase):
     """
 
     def calc_background_rms(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
 
         # ignore RuntimeWarning where axis is all NaN
         with warnings.catch_warnings():
             warnings.simplefilter('ignore', RuntimeWarning)
-            result = mad_std(data, axis=axis, ignore_nan=True)
+            result = fast_nanmad_std(data, axis=axis)
 
         if masked and isinstance(result, np.ndarray):
             result = np.ma.masked_where(np.isnan(result), result)
@@ -657,6 +1296,14 @@ class BiweightScaleBackgroundRMS(BackgroundRMSBase):
         be performed. The default is to perform sigma clipping with
         ``sigma=3.0`` and ``maxiters=5``.
 
+    cache : bool, optional
+        Whether to cache the sigma-clipped data of the two most recent
+        input arrays, so that calling the instance again on the same
+        array does not clip it again. Each cached result keeps a
+        full-size clipped copy of the data in memory until the input
+        array is deleted or ``clear_cache`` is called. The default is
+        `False`.
+
     Examples
     --------
     >>> from astropy.stats import SigmaClip
@@ -680,27 +1327,28 @@ class BiweightScaleBackgroundRMS(BackgroundRMSBase):
     30.09433848589339
     """
 
-    def __init__(self, c=9.0, M=None, sigma_clip=SIGMA_CLIP):
-        super().__init__(sigma_clip=sigma_clip)
+    def __init__(self, c=9.0, M=None, sigma_clip=SIGMA_CLIP, cache=False):
+        super().__init__(sigma_clip=sigma_clip, cache=cache)
         self.c = c
         self.M = M
 
     def __repr__(self):
-        params = ('c', 'M', 'sigma_clip')
+        params = ('c', 'M', 'sigma_clip', 'cache')
         return make_repr(self, params)
 
     def calc_background_rms(self, data, axis=None, masked=False):
-        if self.sigma_clip is not None:
-            data = self.sigma_clip(data, axis=axis, masked=False)
-        elif isinstance(data, np.ma.MaskedArray):
-            # convert to ndarray with masked values replaced by NaN
-            data = data.filled(np.nan)
-
-        # ignore RuntimeWarning where axis is all NaN
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore', RuntimeWarning)
-            result = biweight_scale(data, c=self.c, M=self.M, axis=axis,
-                                    ignore_nan=True)
+        data = _clip_data(data, self.sigma_clip, axis=axis,
+                          cache=self._sigma_clip_cache)
+
+        if _use_fast_biweight(data, self.M, axis):
+            result = np.sqrt(_fast_biweight(data, self.c, self.M,
+                                            biweight_midvariance_1d))
+        else:
+            # ignore RuntimeWarning where axis is all NaN
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                result = biweight_scale(data, c=self.c, M=self.M,
+                                        axis=axis, ignore_nan=True)
 
         if masked and isinstance(result, np.ndarray):
             result = np.ma.masked_where(np.isnan(result), result)
@@ -3,19 +3,31 @@
 Tests for the core module.
 """
 
+import copy
+import pickle
+import warnings
+
 import astropy.units as u
 import numpy as np
 import pytest
 from astropy.stats import SigmaClip
-from numpy.testing import assert_allclose
+from astropy.utils.exceptions import AstropyUserWarning
+from numpy.testing import assert_allclose, assert_equal
 
+from photutils.background._biweight import (biweight_location_1d,
+                                            biweight_midvariance_1d)
+from photutils.background._sigma_clip import sigma_clip_1d
 from photutils.background.core import (BiweightLocationBackground,
                                        BiweightScaleBackgroundRMS,
                                        MADStdBackgroundRMS, MeanBackground,
                                        MedianBackground, MMMBackground,
                                        ModeEstimatorBackground,
-                                       SExtractorBackground, StdBackgroundRMS)
+                                       SExtractorBackground, StdBackgroundRMS,
+                                       _clip_data, _fast_biweight,
+                                       _fast_sigma_clip, _fast_sigma_clip_rows,
+                                       _kernel_values, _SigmaClipCache)
 from photutils.datasets import make_noise_image
+from photutils.extern.biweight import biweight_location, biweight_midvariance
 from photutils.utils._stats import nanmean
 
 BKG = 0.0
@@ -31,6 +43,274 @@ RMS_CLASS = [StdBackgroundRMS, MADStdBackgroundRMS,
 SIGMA_CLIP = SigmaClip(sigma=3.0)
 
 
+def test_clip_data():
+    data = np.ones(100)
+    data[0] = 1.0e5
+    data[1] = np.nan
+    mask = np.zeros(data.shape, dtype=bool)
+    mask[2] = True
+    data = np.ma.MaskedArray(data, mask=mask)
+
+    result = _clip_data(data, None)
+    assert not np.ma.isMaskedArray(result)
+    assert result.shape == (99,)
+    assert np.count_nonzero(np.isnan(result)) == 1
+
+    result = _clip_data(data, None, axis=0)
+    assert not np.ma.isMaskedArray(result)
+    assert result.shape == data.shape
+    assert np.count_nonzero(np.isnan(result)) == 2
+
+    result = _clip_data(np.ma.MaskedArray(np.arange(100), mask=mask), None,
+                        axis=0)
+    assert result.dtype == np.float64
+    assert np.count_nonzero(np.isnan(result)) == 1
+
+    # masked arrays without masked values are not copied
+    data2 = np.ma.MaskedArray(DATA, mask=np.zeros(DATA.shape, dtype=bool))
+    for axis in (None, 1):
+        result = _clip_data(data2, None, axis=axis)
+        assert not np.ma.isMaskedArray(result)
+        assert np.shares_memory(result, DATA)
+
+    with pytest.warns(AstropyUserWarning, match='contains invalid values'):
+        result = _clip_data(data, SIGMA_CLIP)
+    assert result.shape == (97,)
+    assert_allclose(result, 1.0)
+
+
+def test_clip_data_cache():
+    cache = _SigmaClipCache()
+    data = DATA.copy()
+    result = _clip_data(data, SIGMA_CLIP)
+    assert result.flags.writeable
+
+    # the data of a masked array without masked values is a new object
+    # on each call, so it is never cached
+    mdata = np.ma.MaskedArray(data, mask=np.zeros(data.shape, dtype=bool))
+    _clip_data(mdata, SIGMA_CLIP, cache=cache)
+    assert len(cache._entries) == 0
+
+    result = _clip_data(data, SIGMA_CLIP, cache=cache)
+    assert not result.flags.writeable
+    assert len(cache._entries) == 1
+
+
+def test_background_cache():
+    data = DATA.copy()
+    bkg = MedianBackground(SIGMA_CLIP)
+    assert not bkg.cache
+    assert 'cache=False' in repr(bkg)
+    bkg(data)
+    assert len(bkg._cache._entries) == 0
+
+    bkg = MedianBackground(SIGMA_CLIP, cache=True)
+    value = bkg(data)
+    assert len(bkg._cache._entries) == 1
+    assert bkg(data) == value
+    assert len(bkg._cache._entries) == 1
+    bkg.clear_cache()
+    assert len(bkg._cache._entries) == 0
+
+    # the batch methods never use the cache
+    bkg.calc_background_batch(data[None])
+    assert len(bkg._cache._entries) == 0
+
+    # disabling the cache releases the cached results
+    bkg(data)
+    bkg.cache = False
+    bkg(data)
+    assert len(bkg._cache._entries) == 0
+
+    # copies start with an empty cache
+    bkgrms = StdBackgroundRMS(SIGMA_CLIP, cache=True)
+    bkgrms(data)
+    assert len(bkgrms._cache._entries) == 1
+    assert len(copy.deepcopy(bkgrms)._cache._entries) == 0
+    assert len(pickle.loads(pickle.dumps(bkgrms))._cache._entries) == 0
+    bkgrms.clear_cache()
+    assert len(bkgrms._cache._entries) == 0
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int32])
+@pytest.mark.parametrize('sigma_clip', [SigmaClip(sigma=3.0),
+                                        SigmaClip(sigma=2.0, maxiters=None),
+                                        SigmaClip(sigma_lower=1.5,
+                                                  sigma_upper=2.5,
+                                                  maxiters=1)])
+def test_fast_sigma_clip(dtype, sigma_clip):
+    data = (DATA * 100).astype(dtype)
+    data[::7, ::3] += 200
+    result = _fast_sigma_clip(data, sigma_clip)
+    expected = sigma_clip(data, masked=False)
+    assert result.dtype == expected.dtype
+    assert_equal(np.sort(result), np.sort(expected))
+
+
+def test_fast_sigma_clip_inputs():
+    data = DATA.copy()
+    data[0, 0] = 1.0e5
+    mask = np.zeros(data.shape, dtype=bool)
+    mask[1, :10] = True
+    mdata = np.ma.MaskedArray(data, mask=mask)
+    result = _fast_sigma_clip(mdata, SIGMA_CLIP)
+    expected = SIGMA_CLIP(mdata, masked=False)
+    assert_equal(np.sort(result), np.sort(expected))
+
+    result = _fast_sigma_clip(data << u.Jy, SIGMA_CLIP)
+    assert result.unit == u.Jy
+
+    data[0, 1] = np.nan
+    match = 'Input data contains invalid values'
+    with pytest.warns(AstropyUserWarning, match=match):
+        result = _fast_sigma_clip(data, SIGMA_CLIP)
+    with pytest.warns(AstropyUserWarning, match=match):
+        expected = SIGMA_CLIP(data, masked=False)
+    assert_equal(np.sort(result), np.sort(expected))
+
+    assert _fast_sigma_clip(np.array([]), SIGMA_CLIP).size == 0
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('nproc', [1, 3, None])
+def test_fast_sigma_clip_rows(dtype, nproc):
+    data = (DATA * 100).astype(dtype).reshape(4, 50, 50)
+    data[:, ::7, ::3] += 200
+    for sigma_clip in (SIGMA_CLIP, SigmaClip(sigma_lower=1.5, sigma_upper=2,
+                                             maxiters=None)):
+        result = _fast_sigma_clip_rows(data, sigma_clip, nproc=nproc)
+        expected = sigma_clip(data, axis=-1, masked=False)
+        assert result.dtype == expected.dtype
+        assert_equal(result, expected)
+
+
+def test_fast_sigma_clip_rows_inputs():
+    data = DATA.copy()
+    data[0, 1] = np.nan
+    data[1, :] = np.inf
+    match = 'Input data contains invalid values'
+    with pytest.warns(AstropyUserWarning, match=match):
+        result = _fast_sigma_clip_rows(data, SIGMA_CLIP, nproc=2)
+    with pytest.warns(AstropyUserWarning, match=match):
+        expected = SIGMA_CLIP(data, axis=1, masked=False)
+    assert_equal(result, expected)
+    assert np.all(np.isnan(result[1]))
+
+    result = _fast_sigma_clip_rows(DATA << u.Jy, SIGMA_CLIP)
+    assert result.unit == u.Jy
+    assert _fast_sigma_clip_rows(np.ones((0, 5)), SIGMA_CLIP).shape == (0, 5)
+
+
+@pytest.mark.parametrize('axis', [None, 1])
+def test_sigma_clip_cache(axis):
+    cache = _SigmaClipCache()
+    data = DATA.copy()
+    result1 = cache(data, SIGMA_CLIP, axis=axis)
+    result2 = cache(data, SIGMA_CLIP, axis=axis)
+    assert result2 is result1
+    assert not result1.flags.writeable
+
+    # different clipping parameters
+    result3 = cache(data, SigmaClip(sigma=2.0), axis=axis)
+    assert result3 is not result1
+
+    # modifying the data in place invalidates the cached result
+    data[0, 0] = 1.0e5
+    result4 = cache(data, SIGMA_CLIP, axis=axis)
+    assert result4 is not result1
+
+    # the cached results are removed when the data are deleted
+    assert len(cache._entries) == 2
+    del data
+    assert len(cache._entries) == 0
+
+    cache(DATA, SIGMA_CLIP, axis=axis)
+    cache.clear()
+    assert len(cache._entries) == 0
+
+
+def test_sigma_clip_cache_inputs():
+    cache = _SigmaClipCache()
+    data = DATA.copy()
+    data[0, 0] = np.nan
+    match = 'Input data contains invalid values'
+    with pytest.warns(AstropyUserWarning, match=match):
+        result1 = cache(data, SIGMA_CLIP)
+
+    # the warnings are emitted only when the data are clipped
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result2 = cache(data, SIGMA_CLIP)
+    assert result2 is result1
+
+    # lists and non-contiguous arrays are not cached
+    cache.clear()
+    cache(DATA.tolist(), SIGMA_CLIP)
+    cache(DATA[:, ::2], SIGMA_CLIP)
+    assert len(cache._entries) == 0
+
+
+def test_sigma_clip_1d():
+    data = np.ones(100)
+    data[0] = 1.0e5
+    assert sigma_clip_1d(data, 3.0, 3.0, -1) == 99
+
+    # a negative maxiters iterates until convergence
+    data = np.arange(100.0)
+    data[-10:] = 1.0e5 * np.arange(1, 11)
+    npixels = sigma_clip_1d(data.copy(), 3.0, 3.0, 1)
+    assert npixels > sigma_clip_1d(data, 3.0, 3.0, -1)
+
+
+def test_kernel_values():
+    for dtype in (np.float32, np.float64):
+        values = np.ones(3, dtype=dtype)
+        assert _kernel_values(values) is values
+    for dtype in (np.float16, np.int32, bool):
+        values = _kernel_values(np.ones(3, dtype=dtype))
+        assert values.dtype == np.float64
+    assert _kernel_values(np.ones(3) << u.Jy).__class__ is np.ndarray
+
+
+@pytest.mark.parametrize('kernel', [biweight_location_1d,
+                                    biweight_midvariance_1d])
+def test_fast_biweight_float32(kernel):
+    result = _fast_biweight(DATA.astype(np.float32), 6.0, None, kernel)
+    assert result.dtype == np.float64
+    assert_allclose(result, _fast_biweight(DATA, 6.0, None, kernel),
+                    rtol=1.0e-6)
+
+
+@pytest.mark.parametrize('M', [None, 0.1])
+def test_fast_biweight(M):
+    data = DATA.copy()
+    data[0, 0:2] = (np.nan, np.inf)
+    data = np.ma.MaskedArray(data, mask=DATA > 1.0)
+    kwargs = {'M': None if M is None else np.float64(M), 'ignore_nan': True}
+
+    result = _fast_biweight(data, 6.0, M, biweight_location_1d)
+    assert_allclose(result, biweight_location(data, **kwargs))
+    result = _fast_biweight(data, 9.0, M, biweight_midvariance_1d)
+    assert_allclose(result, biweight_midvariance(data, **kwargs))
+
+    result = _fast_biweight(DATA << u.Jy, 6.0, M, biweight_location_1d)
+    assert result.unit == u.Jy
+    result = _fast_biweight(DATA << u.Jy, 9.0, M, biweight_midvariance_1d)
+    assert result.unit == u.Jy**2
+
+
+def test_fast_biweight_constant():
+    data = np.ones(10)
+    data[0] = 10.0
+    assert _fast_biweight(data, 6.0, None, biweight_location_1d) == 1.0
+    assert _fast_biweight(data, 9.0, None, biweight_midvariance_1d) == 0.0
+
+    data = np.full(10, np.nan)
+    assert np.isnan(_fast_biweight(data, 6.0, None, biweight_location_1d))
+    assert np.isnan(_fast_biweight(data, 9.0, None,
+                                   biweight_midvariance_1d))
+
+
 @pytest.mark.parametrize('bkg_class', BKG_CLASS)
 def test_constant_background(bkg_class):
     data = np.ones((100, 100))
@@ -91,6 +371,21 @@ def test_background_axis(bkg_class):
     bkgi = np.array(bkgi)
     assert_allclose(bkg_arr, bkgi)
 
+    # the kept axes have zero size
+    bkg = bkg_class(sigma_clip=None)
+    assert bkg.calc_background(np.ones((0, 5)), axis=1).shape == (0,)
+
+
+@pytest.mark.parametrize('bkg_class', BKG_CLASS)
+def test_background_full_reduction(bkg_class):
+    # a full reduction along explicit axes returns a float
+    bkg = bkg_class(sigma_clip=None)
+    expected = bkg.calc_background(DATA)
+    for data, axis in ((DATA, (0, 1)), (DATA.ravel(), 0)):
+        result = bkg.calc_background(data, axis=axis)
+        assert isinstance(result, float)
+        assert_allclose(result, expected)
+
 
 def test_sourceextrator_background_zero_std():
     data = np.ones((100, 100))
@@ -184,6 +479,10 @@ def test_background_rms_axis(rms_class):
     rmsi = np.array(rmsi)
     assert_allclose(rms_arr, rmsi)
 
+    # the kept axes have zero size
+    bkgrms = rms_class(sigma_clip=None)
+    assert bkgrms.calc_background_rms(np.ones((0, 5)), axis=1).shape == (0,)
+
 
 @pytest.mark.parametrize('rms_class', RMS_CLASS)
 def test_background_rms_nosigmaclip(rms_class):
@@ -265,6 +564,67 @@ def test_background_rms_units(rms_class):
     assert isinstance(rmsval, u.Quantity)
 
 
+@pytest.mark.parametrize('bkg_class', BKG_CLASS)
+@pytest.mark.parametrize('nproc', [1, 2])
+def test_background_batch(bkg_class, nproc):
+    data = DATA.reshape(4, 50, 50)
+    mask = data > 1.0
+    bkg = bkg_class(sigma_clip=SIGMA_CLIP)
+    expected = [bkg.calc_background(cutout) for cutout in data]
+    assert_allclose(bkg.calc_background_batch(data, nproc=nproc), expected)
+
+    data = np.ma.MaskedArray(data, mask=mask)
+    expected = [bkg.calc_background(cutout) for cutout in data]
+    result = bkg.calc_background_batch(data, masked=True)
+    assert isinstance(result, np.ma.MaskedArray)
+    assert_allclose(result, expected)
+
+    result = bkg.calc_background_batch(data << u.Jy)
+    assert result.shape == (4,)
+    assert result.unit == u.Jy
+
+    # integer stacks must not overflow
+    rng = np.random.default_rng(0)
+    data = rng.integers(30000, 50000, size=(3, 10, 10), dtype=np.uint16)
+    bkg = bkg_class(sigma_clip=None)
+    expected = [bkg.calc_background(cutout.astype(float)) for cutout in data]
+    assert_allclose(bkg.calc_background_batch(data, nproc=nproc), expected)
+
+    match = 'data must have at least 2 dimensions'
+    with pytest.raises(ValueError, match=match):
+        bkg.calc_background_batch(np.ones(10))
+
+
+@pytest.mark.parametrize('rms_class', RMS_CLASS)
+@pytest.mark.parametrize('nproc', [1, 2])
+def test_background_rms_batch(rms_class, nproc):
+    data = DATA.reshape(4, 50, 50)
+    mask = data > 1.0
+    bkgrms = rms_class(sigma_clip=SIGMA_CLIP)
+    expected = [bkgrms.calc_background_rms(cutout) for cutout in data]
+    assert_allclose(bkgrms.calc_background_rms_batch(data, nproc=nproc),
+                    expected)
+
+    data = np.ma.MaskedArray(data, mask=mask)
+    expected = [bkgrms.calc_background_rms(cutout) for cutout in data]
+    result = bkgrms.calc_background_rms_batch(data, masked=True)
+    assert isinstance(result, np.ma.MaskedArray)
+    assert_allclose(result, expected)
+
+    # integer stacks must not overflow
+    rng = np.random.default_rng(0)
+    data = rng.integers(30000, 50000, size=(3, 10, 10), dtype=np.uint16)
+    bkgrms = rms_class(sigma_clip=None)
+    expected = [bkgrms.calc_background_rms(cutout.astype(float))
+                for cutout in data]
+    assert_allclose(bkgrms.calc_background_rms_batch(data, nproc=nproc),
+                    expected)
+
+    match = 'data must have at least 2 dimensions'
+    with pytest.raises(ValueError, match=match):
+        bkgrms.calc_background_rms_batch(np.ones(10))
+
+
 @pytest.mark.parametrize('bkg_class', BKG_CLASS)
 def test_background_invalid_sigmaclip(bkg_class):
     match = 'sigma_clip must be an astropy SigmaClip instance or None'
@@ -0,0 +1,31 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Tests for the _select module.
+"""
+
+import numpy as np
+import pytest
+
+from photutils.background._select import introselect_median
+
+RNG = np.random.default_rng(0)
+DATA = [RNG.normal(size=1), RNG.normal(size=2), RNG.normal(size=5),
+        RNG.normal(size=6), RNG.normal(size=1001), RNG.normal(size=10000),
+        np.arange(1000.0), np.arange(1000.0)[::-1], np.zeros(1000),
+        np.repeat(np.arange(5.0), 201), np.tile(np.arange(7.0), 300),
+        np.concatenate((np.arange(500.0), np.arange(500.0)[::-1]))]
+
+
+@pytest.mark.parametrize('data', DATA)
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_introselect_median(data, dtype):
+    data = data.astype(dtype)
+    values = data.copy()
+    assert introselect_median(values) == np.median(data)
+
+    # the array is reordered in place
+    assert np.array_equal(np.sort(values), np.sort(data))
+
+
+def test_introselect_median_empty():
+    assert np.isnan(introselect_median(np.array([])))
@@ -4,6 +4,7 @@ This module defines nan-ignoring statistical functions, using bottleneck
 for performance if available.
 """
 
+import math
 from functools import partial
 
 import numpy as np
@@ -11,6 +12,10 @@ from astropy.units import Quantity
 
 from photutils.utils._optional_deps import HAS_BOTTLENECK
 
+# the factor to convert the median absolute deviation to the standard
+# deviation of a normal distribution (1 / scipy.stats.norm.ppf(0.75))
+MAD_STD_FACTOR = 1.482602218505602
+
 if HAS_BOTTLENECK:
     import bottleneck as bn
 
@@ -143,3 +148,251 @@ else:
     nanmedian = np.nanmedian
     nanstd = np.nanstd
     nanvar = np.nanvar
+
+
+def _valid_values(data):
+    """
+    Return a flattened copy of the valid (non-NaN and unmasked) values
+    of an array.
+
+    Non-float arrays are converted to float64.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input array.
+
+    Returns
+    -------
+    values : 1D `~numpy.ndarray`
+        A copy of the valid values, which can be modified in place.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        data = data.compressed()
+
+    values = np.asanyarray(data).ravel()
+    if values.dtype.kind != 'f':
+        values = values.astype(np.float64)
+
+    # boolean indexing always returns a copy
+    return values[~np.isnan(values)]
+
+
+def _nan_filled(data):
+    """
+    Convert a masked array to a float array where the masked values are
+    replaced by NaN.
+
+    Other inputs are returned unchanged.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        if data.dtype.kind != 'f':
+            data = data.astype(np.float64)
+        data = data.filled(np.nan)
+
+    return data
+
+
+def _median_inplace(values):
+    """
+    Compute the median of a 1D array using a selection algorithm.
+
+    The array is partially sorted in place (introselect), which is
+    O(N) instead of the O(N log N) cost of a full sort. The input array
+    must not contain NaN values and its elements will be reordered.
+
+    Parameters
+    ----------
+    values : 1D `~numpy.ndarray`
+        The input array. It must be a copy that can be modified in
+        place.
+
+    Returns
+    -------
+    result : float
+        The median of the array.
+    """
+    k = values.size // 2
+    values.partition(k)
+    if values.size % 2 == 1:
+        return values[k]
+
+    # after partitioning, the lower middle value is the maximum of the
+    # values below index k
+    return (values[:k].max() + values[k]) / 2
+
+
+def _nanmedian_sorted(data, axis):
+    """
+    Compute the median along the specified axis, ignoring NaNs, using a
+    single vectorized sort.
+
+    The reduced axes are moved to the end and combined into a single
+    contiguous axis, giving a 2D array with one row per output value.
+    The rows are sorted in one call, which places the NaNs at the end
+    of each row, and the median of each row is taken from the middle
+    of its valid values. This avoids the Python-level loop over rows
+    (or the masked-array sort) used by `~numpy.nanmedian` and is
+    typically faster than the row-by-row selection used by bottleneck.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        The input array.
+
+    axis : int or tuple of int
+        The axis or axes along which the median is computed.
+
+    Returns
+    -------
+    result : float or `~numpy.ndarray`
+        The median of the data.
+    """
+    if not isinstance(axis, tuple):
+        axis = (axis,)
+    axis = tuple(ax + data.ndim if ax < 0 else ax for ax in axis)
+    other_axes = tuple(i for i in range(data.ndim) if i not in axis)
+    shape = tuple(data.shape[i] for i in other_axes)
+
+    # the size of the reduced axes is computed explicitly because -1
+    # cannot be inferred in a reshape when the kept axes have zero size
+    npixels = math.prod(data.shape[i] for i in axis)
+    data = np.transpose(data, other_axes + axis).reshape((*shape, npixels))
+    if data.shape[-1] == 0:
+        return nanmedian(data, axis=-1)
+
+    # convert non-float data to float64 so that the sum of the middle
+    # values cannot overflow (e.g., for uint16 data)
+    if data.dtype.kind != 'f':
+        data = data.astype(np.float64)
+
+    data = np.sort(data, axis=-1)
+    nvalid = np.count_nonzero(~np.isnan(data), axis=-1, keepdims=True)
+
+    # rows without valid values give NaN because the lower and upper
+    # indices are both zero
+    lower = np.take_along_axis(data, np.maximum(nvalid - 1, 0) // 2, -1)
+    upper = np.take_along_axis(data, nvalid // 2, -1)
+    result = (lower + upper)[..., 0] / 2
+
+    # return a scalar instead of a 0D array
+    return result[()]
+
+
+def fast_nanmedian(data, axis=None):
+    """
+    Compute the median along the specified axis, ignoring NaNs.
+
+    When ``axis`` is `None`, the median of the valid (non-NaN and
+    unmasked) values is computed using a selection algorithm instead
+    of sorting. When ``axis`` is specified, the medians of all rows are
+    computed together with a single vectorized sort (see
+    ``_nanmedian_sorted``).
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input array. NaN and masked values are ignored.
+
+    axis : int, tuple of int, or `None`, optional
+        The axis or axes along which the median is computed. If `None`,
+        the median of the flattened array is computed.
+
+    Returns
+    -------
+    result : float or `~numpy.ndarray`
+        The median of the data.
+    """
+    if axis is None:
+        values = _valid_values(data)
+        if values.size == 0:
+            return nanmedian(values)
+
+        return _median_inplace(values)
+
+    return _nanmedian_sorted(np.asanyarray(_nan_filled(data)), axis)
+
+
+def nanmedian_mean_std(data):
+    """
+    Compute the median, mean, and standard deviation of an array,
+    ignoring NaNs.
+
+    The valid values are extracted only once and shared by all three
+    statistics. The median is computed using a selection algorithm.
+    The mean and standard deviation are then computed from the sum
+    and the sum of squares of the deviations from the median, which
+    avoids the loss of precision of the naive sum-of-squares formula
+    when the data have a large offset. The sums are accumulated in
+    double precision.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input array. NaN and masked values are ignored.
+
+    Returns
+    -------
+    median, mean, std : float
+        The median, mean, and standard deviation of the data.
+    """
+    values = _valid_values(data)
+    if values.size == 0:
+        nan = nanmedian(values)
+        return nan, nan, nan
+
+    median = _median_inplace(values)
+    values -= median
+    npixels = values.size
+    # always accumulate the sums in double precision (e.g., np.dot
+    # would accumulate float32 data in single precision)
+    offset = values.sum(dtype=np.float64) / npixels
+    var = (np.einsum('i,i->', values, values, dtype=np.float64) / npixels
+           - offset ** 2)
+    mean = (median + offset).astype(values.dtype, copy=False)
+    std = np.sqrt(np.maximum(var, 0)).astype(values.dtype, copy=False)
+
+    return median, mean, std
+
+
+def fast_nanmad_std(data, axis=None):
+    """
+    Compute the standard deviation of an array using the median
+    absolute deviation (MAD), ignoring NaNs.
+
+    The result is equivalent to `astropy.stats.mad_std` with
+    ``ignore_nan=True``. When ``axis`` is `None`, both medians are
+    computed using a selection algorithm on a single copy of the valid
+    values. When ``axis`` is specified, both medians are computed with
+    the vectorized ``fast_nanmedian``.
+
+    Parameters
+    ----------
+    data : array_like or `~numpy.ma.MaskedArray`
+        The input array. NaN and masked values are ignored.
+
+    axis : int, tuple of int, or `None`, optional
+        The axis or axes along which the robust standard deviation is
+        computed. If `None`, the flattened array is used.
+
+    Returns
+    -------
+    result : float or `~numpy.ndarray`
+        The robust standard deviation of the data.
+    """
+    if axis is not None:
+        data = np.asanyarray(_nan_filled(data))
+        median = np.expand_dims(fast_nanmedian(data, axis=axis), axis)
+        deviation = data - median
+        np.abs(deviation, out=deviation)
+        return fast_nanmedian(deviation, axis=axis) * MAD_STD_FACTOR
+
+    values = _valid_values(data)
+    if values.size == 0:
+        return nanmedian(values)
+
+    median = _median_inplace(values)
+    np.subtract(values, median, out=values)
+    np.abs(values, out=values)
+
+    return _median_inplace(values) * MAD_STD_FACTOR
@@ -3,14 +3,18 @@
 Tests for the _stats module.
 """
 
+import warnings
+
 import astropy.units as u
 import numpy as np
 import pytest
-from numpy.testing import assert_equal
+from astropy.stats import mad_std
+from numpy.testing import assert_allclose, assert_equal
 
 from photutils.utils._optional_deps import HAS_BOTTLENECK
-from photutils.utils._stats import (nanmax, nanmean, nanmedian, nanmin, nanstd,
-                                    nansum, nanvar)
+from photutils.utils._stats import (fast_nanmad_std, fast_nanmedian, nanmax,
+                                    nanmean, nanmedian, nanmedian_mean_std,
+                                    nanmin, nanstd, nansum, nanvar)
 
 funcs = [(nansum, np.nansum), (nanmean, np.nanmean),
          (nanmedian, np.nanmedian), (nanstd, np.nanstd),
@@ -30,3 +34,156 @@ def test_nan_funcs(func, axis, use_units):
     result1 = func[0](arr, axis=axis)
     result2 = func[1](arr, axis=axis)
     assert_equal(result1, result2)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int64])
+@pytest.mark.parametrize('axis', [None, 0, 1, (0, 1)])
+@pytest.mark.parametrize('size', [100, 101])
+def test_fast_nanmedian(dtype, axis, size):
+    rng = np.random.default_rng(0)
+    arr = (rng.normal(size=(size, size)) * 100).astype(dtype)
+    result = fast_nanmedian(arr, axis=axis)
+    assert_allclose(result, np.median(arr, axis=axis))
+
+    if dtype != np.int64:
+        arr[::3, ::5] = np.nan
+        result = fast_nanmedian(arr, axis=axis)
+        assert_allclose(result, np.nanmedian(arr, axis=axis))
+
+
+@pytest.mark.parametrize('axis', [0, -1, (0, 2), (-1, 1), (0, 1, 2)])
+def test_fast_nanmedian_axis(axis):
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=(6, 7, 8))
+    arr[::2, 1::3, ::4] = np.nan
+    arr[0, 0] = np.nan
+    arr[1, :, 0] = np.nan
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        expected = np.nanmedian(arr, axis=axis)
+    result = fast_nanmedian(arr, axis=axis)
+    assert np.shape(result) == np.shape(expected)
+    assert_allclose(result, expected)
+
+    result = fast_nanmedian(arr << u.m, axis=axis)
+    assert result.unit == u.m
+    assert_allclose(result.value, expected)
+
+    # zero-size arrays
+    for arr in (np.ones((0, 7, 8)), np.ones((6, 0, 8))):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            expected = np.nanmedian(arr, axis=axis)
+            result = fast_nanmedian(arr, axis=axis)
+        assert np.shape(result) == np.shape(expected)
+        assert_equal(result, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.uint16, np.int8])
+def test_fast_nanmedian_axis_int(dtype):
+    # the sum of the middle values must not overflow
+    arr = np.array([[40000, 40002, 50000, 30000], [100, 120, 127, 90]])
+    if dtype == np.int8:
+        arr = arr[1:]
+    arr = arr.astype(dtype)
+    expected = np.median(arr.astype(float), axis=1)
+    result = fast_nanmedian(arr, axis=1)
+    assert result.dtype == np.float64
+    assert_equal(result, expected)
+
+
+@pytest.mark.parametrize('axis', [None, 1])
+def test_fast_nanmedian_masked(axis):
+    arr = np.arange(60.0).reshape(3, 20)
+    mask = np.zeros(arr.shape, dtype=bool)
+    mask[:, :5] = True
+    marr = np.ma.MaskedArray(arr, mask=mask)
+    result = fast_nanmedian(marr, axis=axis)
+    expected = np.median(arr[:, 5:], axis=axis)
+    assert_allclose(result, expected)
+
+
+def test_fast_nanmedian_units():
+    arr = np.arange(11.0) << u.m
+    result = fast_nanmedian(arr)
+    assert result == 5.0 * u.m
+
+
+def test_fast_nanmedian_allnan():
+    arr = np.full(10, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        assert np.isnan(fast_nanmedian(arr))
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_nanmedian_mean_std(dtype):
+    rng = np.random.default_rng(0)
+    arr = rng.normal(loc=1.0e4, scale=2.0, size=(101, 100)).astype(dtype)
+    arr[::3, ::5] = np.nan
+    median, mean, std = nanmedian_mean_std(arr)
+    assert_allclose(median, np.nanmedian(arr))
+    assert_allclose(mean, np.nanmean(arr))
+    assert_allclose(std, np.nanstd(arr, dtype=np.float64), rtol=1.0e-5)
+
+    marr = np.ma.MaskedArray(arr, mask=np.isnan(arr))
+    assert_allclose(nanmedian_mean_std(marr), (median, mean, std))
+
+    arr = np.ones(10) << u.m
+    median, mean, std = nanmedian_mean_std(arr)
+    assert median == 1.0 * u.m
+    assert mean == 1.0 * u.m
+    assert std == 0.0 * u.m
+
+
+def test_nanmedian_mean_std_float32_accuracy():
+    # the sums must be accumulated in double precision for large
+    # float32 arrays
+    rng = np.random.default_rng(0)
+    arr = rng.normal(loc=100.0, scale=10.0, size=(4000, 4000))
+    arr = arr.astype(np.float32)
+    median, mean, std = nanmedian_mean_std(arr)
+    assert mean.dtype == np.float32
+    assert std.dtype == np.float32
+    assert_allclose(mean, np.mean(arr, dtype=np.float64), rtol=1.0e-7)
+    assert_allclose(std, np.std(arr, dtype=np.float64), rtol=1.0e-7)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int64])
+@pytest.mark.parametrize('size', [100, 101])
+def test_fast_nanmad_std(dtype, size):
+    rng = np.random.default_rng(0)
+    arr = (rng.normal(size=(size, size)) * 100).astype(dtype)
+    assert_allclose(fast_nanmad_std(arr), mad_std(arr), rtol=1.0e-6)
+
+    if dtype != np.int64:
+        arr[::3, ::5] = np.nan
+        assert_allclose(fast_nanmad_std(arr), mad_std(arr, ignore_nan=True),
+                        rtol=1.0e-6)
+
+    arr = np.ones(10) << u.m
+    assert fast_nanmad_std(arr) == 0.0 * u.m
+
+
+@pytest.mark.parametrize('axis', [0, -1, (0, 2), (0, 1, 2)])
+def test_fast_nanmad_std_axis(axis):
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=(6, 7, 8)).astype(np.float32)
+    arr[::2, 1::3, ::4] = np.nan
+    result = fast_nanmad_std(arr, axis=axis)
+    expected = mad_std(arr, axis=axis, ignore_nan=True)
+    assert_allclose(result, expected, rtol=1.0e-6)
+
+    marr = np.ma.MaskedArray(arr, mask=np.isnan(arr))
+    assert_allclose(fast_nanmad_std(marr, axis=axis), expected, rtol=1.0e-6)
+
+
+@pytest.mark.parametrize('dtype', [np.uint16, np.int8, np.int64])
+def test_fast_nanmad_std_axis_int(dtype):
+    rng = np.random.default_rng(0)
+    info = np.iinfo(dtype)
+    arr = rng.integers(max(info.min, -30000), min(info.max, 60000),
+                       size=(6, 7, 8), endpoint=True).astype(dtype)
+    result = fast_nanmad_std(arr, axis=-1)
+    expected = mad_std(arr.astype(float), axis=-1)
+    assert_allclose(result, expected, rtol=1.0e-12)